@@ -70,6 +70,9 @@ class CanvasBezierLineMov(QGraphicsPathItem):
                         port_type2str(self.m_port_type),
                         self.parentItem()))
 
+    def release(self):
+        canvas.scene.removeItem(self)
+
     def setReadyToDisc(self, yesno):
         self.m_ready_to_disc = yesno
 
@@ -21,14 +21,15 @@
 import math
 import sys
 import time
+from array import array
+from functools import lru_cache
 
 from sip import voidptr
-from struct import pack
 
-from PyQt5.QtCore import (qCritical, Qt, QPoint, QPointF, QRectF, QTimer,
+from PyQt5.QtCore import (qCritical, Qt, QLineF, QPoint, QPointF, QRectF, QTimer,
                           pyqtSignal, QMarginsF, QTimer)
-from PyQt5.QtGui import (QCursor, QFont, QFontMetrics, QImage,
-                         QLinearGradient, QPainter, QPen, QPolygonF,
+from PyQt5.QtGui import (QBrush, QCursor, QFont, QFontMetrics, QImage,
+                         QLinearGradient, QPainter, QPainterPath, QPen, QPolygonF,
                          QColor, QIcon, QPixmap)
 from PyQt5.QtWidgets import QGraphicsItem, QMenu, QApplication
 
@@ -96,6 +97,73 @@ UNWRAP_BUTTON_LEFT = 1
 UNWRAP_BUTTON_CENTER = 2
 UNWRAP_BUTTON_RIGHT = 3
 
+# vertical offsets of title lines,
+# key is (number of title lines, first line is little)
+_TITLE_Y_DELTAS = {
+    (2, False): (-6, 9),
+    (3, False): (-6, 9, 24),
+    (4, False): (-9, 2, 13, 24),
+    (2, True): (-7, 9),
+    (3, True): (-7, 9, 24),
+    (4, True): (-7, 9, 24),
+}
+
+def _polygon_from_coords(coords: tuple)->QPolygonF:
+    ''' returns a QPolygonF from a flat sequence of coords
+        (x0, y0, x1, y1, ...), points are copied in one memory copy
+        into the polygon buffer instead of appending them one by one. '''
+    n_points = len(coords) // 2
+    polygon = QPolygonF(n_points)
+    # a QPointF is two doubles
+    buffer = polygon.data()
+    buffer.setsize(n_points * 16)
+    memoryview(buffer)[:] = array('d', coords).tobytes()
+    return polygon
+
+_striped_brushes = {}
+
+def _get_striped_brush(size: float, color_main: QColor, color_alter: QColor,
+                       stripe_size: int, power=1.0)->QBrush:
+    ''' returns a diagonal striped gradient brush from (0, 0) to (size, size).
+        Brushes are cached, because box sizes are often the same. '''
+    key = (size, color_main.rgba(), color_alter.rgba(), stripe_size, power)
+    brush = _striped_brushes.get(key)
+    if brush is not None:
+        return brush
+
+    gradient = QLinearGradient(0, 0, size, size)
+    gradient.setColorAt(0, color_main)
+    tot = int(size / stripe_size)
+    for i in range(tot):
+        if i % 2 == 0:
+            gradient.setColorAt((i/tot) ** power, color_main)
+        else:
+            gradient.setColorAt((i/tot) ** power, color_alter)
+
+    if len(_striped_brushes) >= 256:
+        _striped_brushes.clear()
+
+    brush = QBrush(gradient)
+    _striped_brushes[key] = brush
+    return brush
+
+# icons used in context menus, loaded only once
+_menu_icons = {}
+
+def _get_menu_icon(icon_path: str, from_theme=False)->QIcon:
+    key = (icon_path, from_theme)
+    icon = _menu_icons.get(key)
+    if icon is None:
+        if from_theme:
+            icon = QIcon.fromTheme(icon_path)
+        else:
+            icon = QIcon(QPixmap(icon_path))
+        _menu_icons[key] = icon
+    return icon
+
+# group icons in the disconnect menu, this does file lookups
+_get_group_icon = lru_cache(maxsize=64)(CanvasGetIcon)
+
 # ------------------------------------------------------------------------------------------------------------
 
 class cb_line_t(object):
@@ -122,11 +190,21 @@ class TitleLine:
         if not little:
             self.font.setWeight(QFont.Bold)
 
-        self.size = QFontMetrics(self.font).width(text)
+        self._text_widths = {}
+        self.size = self.text_width(text)
 
     def reduce_pixel(self, reduce):
         self.font.setPixelSize(canvas.theme.box_font_size - reduce)
-        self.size = QFontMetrics(self.font).width(self.text)
+        self._text_widths.clear()
+        self.size = self.text_width(self.text)
+
+    def text_width(self, text: str)->int:
+        ''' width of text with this title line font, memoized '''
+        width = self._text_widths.get(text)
+        if width is None:
+            width = QFontMetrics(self.font).width(text)
+            self._text_widths[text] = width
+        return width
 
 # ------------------------------------------------------------------------------------------------------------
 
@@ -146,11 +224,13 @@ class CanvasBox(QGraphicsItem):
         self.m_icon_type = icon_type
 
         self._title_lines = [TitleLine(group_name)]
+        self._max_title_size = self._title_lines[0].size
 
         # plugin Id, < 0 if invalid
         self.m_plugin_id = -1
         self.m_plugin_ui = False
         self.m_plugin_inline = self.INLINE_DISPLAY_DISABLED
+        self._inline_active = False
 
         # Base Variables
         self.p_width = 50
@@ -172,7 +252,7 @@ class CanvasBox(QGraphicsItem):
         self.m_mouse_down = False
         self.m_inline_data = None
         self.m_inline_image = None
-        self.m_inline_scaling = 1.0
+        self.m_inline_scaling_q = 1000
 
         self.m_port_list_ids = []
         self.m_connection_lines = []
@@ -196,7 +276,15 @@ class CanvasBox(QGraphicsItem):
         self.m_font_port.setWeight(canvas.theme.port_font_state)
 
         self._is_hardware = bool(icon_type == ICON_HARDWARE)
-        self._hw_polygon = QPolygonF()
+        self._hw_rack_sig = None
+        self._hw_gradient = None
+        self._hw_path = None
+        self._mon_poly_sig = None
+        self._mon_poly = None
+        self._title_layout_sig = None
+        self._title_deco_lines = []
+        self._title_draw_xs = []
+        self._title_draw_ys = []
         self._icon_name = icon_name
 
         self._wrapped = False
@@ -238,6 +326,10 @@ class CanvasBox(QGraphicsItem):
                       | QGraphicsItem.ItemIsMovable
                       | QGraphicsItem.ItemIsSelectable)
 
+        # needed to get the real exposed rect in paint
+        if self._is_hardware:
+            self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption, True)
+
         # Wait for at least 1 port
         if options.auto_hide_groups:
             self.setVisible(False)
@@ -285,7 +377,7 @@ class CanvasBox(QGraphicsItem):
         #del self.m_inline_image
         #self.m_inline_data = None
         #self.m_inline_image = None
-        #self.m_inline_scaling = 1.0
+        #self.m_inline_scaling_q = 1000
 
         self.m_plugin_id = -1
         self.m_plugin_ui = False
@@ -296,14 +388,14 @@ class CanvasBox(QGraphicsItem):
             hasInlineDisplay = False
 
         if not hasInlineDisplay:
-            del self.m_inline_image
-            self.m_inline_data = None
             self.m_inline_image = None
-            self.m_inline_scaling = 1.0
+            self.m_inline_data = None
+            self.m_inline_scaling_q = 1000
 
         self.m_plugin_id = plugin_id
         self.m_plugin_ui = hasUI
         self.m_plugin_inline = self.INLINE_DISPLAY_ENABLED if hasInlineDisplay else self.INLINE_DISPLAY_DISABLED
+        self._inline_active = hasInlineDisplay
         self.update()
 
     def setIcon(self, icon_type, icon_name):
@@ -625,19 +717,30 @@ class CanvasBox(QGraphicsItem):
 
         self.prepareGeometryChange()
 
+        # bind often used attributes to locals,
+        # they are read a lot of times in the port loops below
+        theme = canvas.theme
+        port_offset = theme.port_offset
+        port_height = theme.port_height
+        group_id = self.m_group_id
+        portgrp_list = canvas.portgrp_list
+        port_list_all = canvas.port_list
+
         # Get Port List
         port_list = []
-        self.m_current_port_mode = PORT_MODE_NULL
+        cur_port_mode = PORT_MODE_NULL
 
-        for port in canvas.port_list:
-            if port.group_id == self.m_group_id and port.port_id in self.m_port_list_ids:
+        for port in port_list_all:
+            if port.group_id == group_id and port.port_id in self.m_port_list_ids:
                 port_list.append(port)
 
                 # used to know present port modes (INPUT or OUTPUT)
-                self.m_current_port_mode |= port.port_mode
+                cur_port_mode |= port.port_mode
+
+        self.m_current_port_mode = cur_port_mode
 
         max_in_width = max_out_width = 0
-        port_spacing = canvas.theme.port_height + canvas.theme.port_spacing
+        port_spacing = port_height + theme.port_spacing
 
         # Get Max Box Width, vertical ports re-positioning
         port_types = [PORT_TYPE_AUDIO_JACK, PORT_TYPE_MIDI_JACK,
@@ -645,14 +748,18 @@ class CanvasBox(QGraphicsItem):
         last_in_type = last_out_type = PORT_TYPE_NULL
         last_in_alter = last_out_alter = False
         
-        last_in_pos = last_out_pos = (canvas.theme.box_header_height
-                                      + canvas.theme.box_header_spacing)
+        last_in_pos = last_out_pos = (theme.box_header_height
+                                      + theme.box_header_spacing)
         
         final_last_in_pos = final_last_out_pos = last_in_pos
 
         wrapped_port_pos = last_in_pos
         last_of_portgrp = True
 
+        # ports and portgroups widgets with their new y position
+        y_widgets = []
+        y_values = []
+
         align_port_types = True
         port_types_aligner = []
 
@@ -701,7 +808,7 @@ class CanvasBox(QGraphicsItem):
                     #last_in_pos = last_out_pos = max(last_in_pos, last_out_pos)
                     
                     port_pos, pg_len = CanvasGetPortGroupPosition(
-                        self.m_group_id, port.port_id, port.portgrp_id)
+                        group_id, port.port_id, port.portgrp_id)
                     first_of_portgrp = bool(port_pos == 0)
                     last_of_portgrp = bool(port_pos + 1 == pg_len)
                     size = 0
@@ -709,24 +816,24 @@ class CanvasBox(QGraphicsItem):
                     max_pwidth = options.max_port_width
 
                     if port.portgrp_id:
-                        for portgrp in canvas.portgrp_list:
-                            if not (portgrp.group_id == self.m_group_id
+                        for portgrp in portgrp_list:
+                            if not (portgrp.group_id == group_id
                                     and portgrp.portgrp_id == port.portgrp_id):
                                 continue
                             
                             if port.port_id == portgrp.port_id_list[0]:
                                 portgrp_name = CanvasGetPortGroupName(
-                                    self.m_group_id, portgrp.port_id_list)
+                                    group_id, portgrp.port_id_list)
 
                                 if portgrp_name:
                                     portgrp.widget.set_print_name(
-                                        portgrp_name, max_pwidth - canvas.theme.port_in_portgrp_width - 5)
+                                        portgrp_name, max_pwidth - theme.port_in_portgrp_width - 5)
                                 else:
                                     portgrp.widget.set_print_name('', 0)
                             
                             port.widget.set_print_name(
                                 CanvasGetPortPrintName(
-                                    self.m_group_id, port.port_id, port.portgrp_id),
+                                    group_id, port.port_id, port.portgrp_id),
                                 int(max_pwidth/2))
 
                             if portgrp.widget.get_text_width() + 5 > max_pwidth - port.widget.get_text_width():
@@ -734,7 +841,7 @@ class CanvasBox(QGraphicsItem):
 
                             size = portgrp.widget.get_text_width() \
                                    + max(port.widget.get_text_width() + 6,
-                                         canvas.theme.port_in_portgrp_width)
+                                         theme.port_in_portgrp_width)
                             break
                     else:
                         port.widget.set_print_name(port.port_name, max_pwidth)
@@ -745,76 +852,84 @@ class CanvasBox(QGraphicsItem):
                         if (port.port_type != last_in_type
                                 or port.is_alternate != last_in_alter):
                             if last_in_type != PORT_TYPE_NULL:
-                                last_in_pos += canvas.theme.port_spacingT
+                                last_in_pos += theme.port_spacingT
                             last_in_type = port.port_type
                             last_in_alter = port.is_alternate
 
                         if self._wrapping:
-                            port.widget.setY(last_in_pos
-                                            - (last_in_pos - wrapped_port_pos)
-                                                * self._wrapping_ratio)
+                            port_y = (last_in_pos
+                                      - (last_in_pos - wrapped_port_pos)
+                                        * self._wrapping_ratio)
                         elif self._unwrapping:
-                            port.widget.setY(wrapped_port_pos
-                                            + (last_in_pos - wrapped_port_pos)
-                                                * self._wrapping_ratio)
+                            port_y = (wrapped_port_pos
+                                      + (last_in_pos - wrapped_port_pos)
+                                        * self._wrapping_ratio)
                         elif self._wrapped:
-                            port.widget.setY(wrapped_port_pos)
+                            port_y = wrapped_port_pos
                         else:
-                            port.widget.setY(last_in_pos)
+                            port_y = last_in_pos
+
+                        y_widgets.append(port.widget)
+                        y_values.append(port_y)
 
                         if port.portgrp_id and first_of_portgrp:
-                            for portgrp in canvas.portgrp_list:
-                                if (portgrp.group_id == self.m_group_id
+                            for portgrp in portgrp_list:
+                                if (portgrp.group_id == group_id
                                         and portgrp.portgrp_id == port.portgrp_id):
                                     if portgrp.widget is not None:
+                                        y_widgets.append(portgrp.widget)
                                         if self._wrapped:
-                                            portgrp.widget.setY(wrapped_port_pos)
+                                            y_values.append(wrapped_port_pos)
                                         else:
-                                            portgrp.widget.setY(last_in_pos)
+                                            y_values.append(last_in_pos)
                                     break
 
                         if last_of_portgrp:
                             last_in_pos += port_spacing
                         else:
-                            last_in_pos += canvas.theme.port_height
+                            last_in_pos += port_height
 
                     elif port.port_mode == PORT_MODE_OUTPUT:
                         max_out_width = max(max_out_width, size)
                         if (port.port_type != last_out_type
                                 or port.is_alternate != last_out_alter):
                             if last_out_type != PORT_TYPE_NULL:
-                                last_out_pos += canvas.theme.port_spacingT
+                                last_out_pos += theme.port_spacingT
                             last_out_type = port.port_type
                             last_out_alter = port.is_alternate
 
                         if self._wrapping:
-                            port.widget.setY(last_out_pos
-                                            - (last_out_pos - wrapped_port_pos)
-                                              * self._wrapping_ratio)
+                            port_y = (last_out_pos
+                                      - (last_out_pos - wrapped_port_pos)
+                                        * self._wrapping_ratio)
                         elif self._unwrapping:
-                            port.widget.setY(wrapped_port_pos
-                                            + (last_out_pos - wrapped_port_pos)
-                                                * self._wrapping_ratio)
+                            port_y = (wrapped_port_pos
+                                      + (last_out_pos - wrapped_port_pos)
+                                        * self._wrapping_ratio)
                         elif self._wrapped:
-                            port.widget.setY(wrapped_port_pos)
+                            port_y = wrapped_port_pos
                         else:
-                            port.widget.setY(last_out_pos)
+                            port_y = last_out_pos
+
+                        y_widgets.append(port.widget)
+                        y_values.append(port_y)
 
                         if port.portgrp_id and first_of_portgrp:
-                            for portgrp in canvas.portgrp_list:
-                                if (portgrp.group_id == self.m_group_id
+                            for portgrp in portgrp_list:
+                                if (portgrp.group_id == group_id
                                         and portgrp.portgrp_id == port.portgrp_id):
                                     if portgrp.widget is not None:
+                                        y_widgets.append(portgrp.widget)
                                         if self._wrapped:
-                                            portgrp.widget.setY(wrapped_port_pos)
+                                            y_values.append(wrapped_port_pos)
                                         else:
-                                            portgrp.widget.setY(last_out_pos)
+                                            y_values.append(last_out_pos)
                                     break
 
                         if last_of_portgrp:
                             last_out_pos += port_spacing
                         else:
-                            last_out_pos += canvas.theme.port_height
+                            last_out_pos += port_height
                 
                     final_last_in_pos = last_in_pos
                     final_last_out_pos = last_out_pos
@@ -910,25 +1025,20 @@ class CanvasBox(QGraphicsItem):
         self.p_width = max(self.p_width,
                            all_title_templates[lines_choice]['header_width'])
         max_title_size = all_title_templates[lines_choice]['title_width']
+        self._max_title_size = max_title_size
 
-        if more_height:
-            # down ports
-            for port in port_list:
-                port.widget.setY(port.widget.y() + more_height)
-
-            # down portgroups
-            for portgrp in canvas.portgrp_list:
-                if (portgrp.group_id == self.m_group_id
-                        and self.m_current_port_mode & portgrp.port_mode):
-                    if portgrp.widget is not None:
-                        portgrp.widget.setY(portgrp.widget.y() + more_height)
+        # apply ports and portgroups vertical positions,
+        # once we know if title needs more height
+        for widget, y in zip(y_widgets, y_values):
+            widget.setY(y + more_height)
 
+        if more_height:
             last_in_pos += more_height
             last_out_pos += more_height
 
         # Horizontal ports re-positioning
-        inX = canvas.theme.port_offset
-        outX = self.p_width - max_out_width - canvas.theme.port_offset - 12
+        inX = port_offset
+        outX = self.p_width - max_out_width - port_offset - 12
 
         # Horizontal ports not in portgroup re-positioning
         for port in port_list:
@@ -943,23 +1053,23 @@ class CanvasBox(QGraphicsItem):
                 port.widget.setPortWidth(max_out_width)
 
         # Horizontal portgroups and ports in portgroup re-positioning
-        for portgrp in canvas.portgrp_list:
-            if (portgrp.group_id != self.m_group_id
-                    or not self.m_current_port_mode & portgrp.port_mode):
+        for portgrp in portgrp_list:
+            if (portgrp.group_id != group_id
+                    or not cur_port_mode & portgrp.port_mode):
                 continue
 
             if portgrp.widget is not None:
                 if portgrp.port_mode == PORT_MODE_INPUT:
                     portgrp.widget.setPortGroupWidth(max_in_width)
-                    portgrp.widget.setX(canvas.theme.port_offset +1)
+                    portgrp.widget.setX(port_offset +1)
                 elif portgrp.port_mode == PORT_MODE_OUTPUT:
                     portgrp.widget.setPortGroupWidth(max_out_width)
                     portgrp.widget.setX(outX)
 
-            max_port_in_pg_width = canvas.theme.port_in_portgrp_width
+            max_port_in_pg_width = theme.port_in_portgrp_width
 
-            for port in canvas.port_list:
-                if (port.group_id == self.m_group_id
+            for port in port_list_all:
+                if (port.group_id == group_id
                         and port.port_id in portgrp.port_id_list
                         and port.widget is not None):
                     port_print_width = port.widget.get_text_width()
@@ -971,13 +1081,13 @@ class CanvasBox(QGraphicsItem):
                         max_port_in_pg_width = max(max_port_in_pg_width,
                                                    port_print_width + 4)
 
-            out_in_portgrpX = (self.p_width - canvas.theme.port_offset - 12
+            out_in_portgrpX = (self.p_width - port_offset - 12
                                - max_port_in_pg_width)
 
             portgrp.widget.set_ports_width(max_port_in_pg_width)
 
-            for port in canvas.port_list:
-                if (port.group_id == self.m_group_id
+            for port in port_list_all:
+                if (port.group_id == group_id
                         and port.port_id in portgrp.port_id_list
                         and port.widget is not None):
                     port.widget.setPortWidth(max_port_in_pg_width)
@@ -988,12 +1098,12 @@ class CanvasBox(QGraphicsItem):
 
         # wrapped/unwrapped sizes
         normal_height = max(last_in_pos, last_out_pos)
-        wrapped_height = wrapped_port_pos + canvas.theme.port_height
+        wrapped_height = wrapped_port_pos + port_height
         if len(self._title_lines) >= 3:
             wrapped_height += 14
-            self.p_header_height = canvas.theme.box_header_height + 14
+            self.p_header_height = theme.box_header_height + 14
         else:
-            self.p_header_height = canvas.theme.box_header_height
+            self.p_header_height = theme.box_header_height
 
         if self._wrapping:
             self.p_height = normal_height \
@@ -1017,10 +1127,10 @@ class CanvasBox(QGraphicsItem):
                 else:
                     self.p_unwrap_triangle_pos = UNWRAP_BUTTON_CENTER
 
-        down_height = max(canvas.theme.port_spacing,
-                          canvas.theme.port_spacingT) \
-                        - canvas.theme.port_spacing \
-                        + canvas.theme.box_pen.widthF()
+        down_height = max(theme.port_spacing,
+                          theme.port_spacingT) \
+                        - theme.port_spacing \
+                        + theme.box_pen.widthF()
 
         self.p_wrapped_height = wrapped_height + down_height
         self.p_unwrapped_height = normal_height + down_height
@@ -1108,7 +1218,7 @@ class CanvasBox(QGraphicsItem):
         # Disconnect menu stuff
         discMenu = QMenu(_translate('patchbay', "Disconnect"), menu)
         discMenu.setIcon(
-            QIcon(QPixmap(':scalable/breeze%s/lines-disconnector' % dark)))
+            _get_menu_icon(':scalable/breeze%s/lines-disconnector' % dark))
 
         conn_list_ids = []
         disconnect_list = [] # will contains disconnect_element dicts
@@ -1168,7 +1278,7 @@ class CanvasBox(QGraphicsItem):
 
                             act_x_disc1 = discMenu.addAction(
                                 group.group_name + outs_label)
-                            act_x_disc1.setIcon(CanvasGetIcon(
+                            act_x_disc1.setIcon(_get_group_icon(
                                 group.icon_type, group.icon_name, PORT_MODE_OUTPUT))
                             act_x_disc1.setData(
                                 disconnect_element['connection_out_ids'])
@@ -1177,7 +1287,7 @@ class CanvasBox(QGraphicsItem):
 
                             act_x_disc2 = discMenu.addAction(
                                 group.group_name + ins_label)
-                            act_x_disc2.setIcon(CanvasGetIcon(
+                            act_x_disc2.setIcon(_get_group_icon(
                                 group.icon_type, group.icon_name, PORT_MODE_INPUT))
                             act_x_disc2.setData(
                                 disconnect_element['connection_in_ids'])
@@ -1191,7 +1301,7 @@ class CanvasBox(QGraphicsItem):
                                 port_mode = PORT_MODE_INPUT
 
                             act_x_disc = discMenu.addAction(group.group_name)
-                            icon = CanvasGetIcon(
+                            icon = _get_group_icon(
                                 group.icon_type, group.icon_name, port_mode)
                             act_x_disc.setIcon(icon)
                             act_x_disc.setData(
@@ -1208,24 +1318,24 @@ class CanvasBox(QGraphicsItem):
         act_x_disc_all = menu.addAction(
             _translate('patchbay', "Disconnect &All"))
         act_x_disc_all.setIcon(
-            QIcon(QPixmap(':scalable/breeze%s/lines-disconnector' % dark)))
+            _get_menu_icon(':scalable/breeze%s/lines-disconnector' % dark))
         act_x_sep1 = menu.addSeparator()
         act_x_info = menu.addAction(_translate('patchbay', "Info"))
         act_x_rename = menu.addAction(_translate('patchbay', "Rename"))
         act_x_sep2 = menu.addSeparator()
         split_join_name = _translate('patchbay', "Split")
-        split_join_icon = QIcon.fromTheme('split')
+        split_join_icon = _get_menu_icon('split', from_theme=True)
         if self.m_splitted:
             split_join_name = _translate('patchbay', "Join")
-            split_join_icon = QIcon.fromTheme('join')
+            split_join_icon = _get_menu_icon('join', from_theme=True)
         act_x_split_join = menu.addAction(split_join_name)
         act_x_split_join.setIcon(split_join_icon)
 
         wrap_title = _translate('patchbay', 'Wrap')
-        wrap_icon = QIcon.fromTheme('pan-up-symbolic')
+        wrap_icon = _get_menu_icon('pan-up-symbolic', from_theme=True)
         if self._wrapped:
             wrap_title = _translate('patchbay', 'Unwrap')
-            wrap_icon = QIcon.fromTheme('pan-down-symbolic')
+            wrap_icon = _get_menu_icon('pan-down-symbolic', from_theme=True)
 
         act_x_wrap = menu.addAction(wrap_title)
         act_x_wrap.setIcon(wrap_icon)
@@ -1358,9 +1468,17 @@ class CanvasBox(QGraphicsItem):
 
         elif event.button() == Qt.LeftButton:
             if QApplication.keyboardModifiers() & Qt.ShiftModifier:
-                boxes = self._get_adjacent_boxes()
-                for box in boxes:
-                    box.setSelected(True)
+                # selectionChanged is emitted only once for all boxes
+                selection_changed = False
+                was_blocked = canvas.scene.blockSignals(True)
+                for box in self._get_adjacent_boxes():
+                    if not box.isSelected():
+                        box.setSelected(True)
+                        selection_changed = True
+                canvas.scene.blockSignals(was_blocked)
+
+                if selection_changed:
+                    canvas.scene.selectionChanged.emit()
                 return
             
             if self.sceneBoundingRect().contains(event.scenePos()):
@@ -1451,11 +1569,8 @@ class CanvasBox(QGraphicsItem):
             self.fixPosAfterMove()
 
             # get all selected boxes
-            repulsers = []
-            for group in canvas.group_list:
-                for widget in group.widgets:
-                    if widget is not None and widget.isSelected():
-                        repulsers.append(widget)
+            repulsers = [item for item in canvas.scene.selectedItems()
+                         if item.type() == CanvasBoxType]
 
             canvas.scene.deplace_boxes_from_repulsers(repulsers)
             QTimer.singleShot(0, canvas.scene.update)
@@ -1506,144 +1621,212 @@ class CanvasBox(QGraphicsItem):
                           self.p_height + 2 * hws)
         return QRectF(0, 0, self.p_width, self.p_height)
 
+    def _build_hardware_rack(self, d: float, lineHinting: float)->tuple:
+        ''' returns the gradient and the painter path of the hardware rack,
+            they only depend on box size and port modes '''
+        hw_gradient = QLinearGradient(-d, -d, self.p_width +d, self.p_height +d)
+        hw_gradient.setColorAt(0, QColor(60, 60, 43))
+        hw_gradient.setColorAt(0.5, QColor(40, 40, 24))
+        hw_gradient.setColorAt(1, QColor(60, 60, 43))
+
+        if self.m_current_port_mode != PORT_MODE_INPUT + PORT_MODE_OUTPUT:
+            if self.m_current_port_mode == PORT_MODE_INPUT:
+                hardware_poly = _polygon_from_coords((
+                    - lineHinting, - lineHinting,
+                    - lineHinting, 34,
+                    -d /2.0, 34,
+                    -d, 34 - d / 2.0,
+                    -d, -d / 2.0,
+                    -d / 2.0, -d,
+                    self.p_width + d/2.0, -d,
+                    self.p_width + d, -d / 2.0,
+                    self.p_width + d, self.p_height + d/2.0,
+                    self.p_width + d/2.0, self.p_height + d,
+                    -d/2.0, self.p_height +d,
+                    -d, self.p_height +d/2.0,
+                    -d, self.p_height -3 + d/2.0,
+                    -d/2.0, self.p_height -3,
+                    - lineHinting, self.p_height -3,
+                    - lineHinting, self.p_height + lineHinting,
+                    self.p_width + lineHinting, self.p_height + lineHinting,
+                    self.p_width + lineHinting, - lineHinting,
+                ))
+            else:
+                hardware_poly = _polygon_from_coords((
+                    self.p_width + lineHinting, - lineHinting,
+                    self.p_width + lineHinting, 34,
+                    self.p_width + d/2.0, 34,
+                    self.p_width + d, 34 - d/2.0,
+                    self.p_width +d, -d / 2.0,
+                    self.p_width + d/2.0, -d,
+                    -d / 2.0, -d,
+                    -d, -d/2.0,
+                    -d, self.p_height + d/2.0,
+                    -d/2.0, self.p_height + d,
+                    self.p_width + d/2.0, self.p_height + d,
+                    self.p_width + d, self.p_height + d/2.0,
+                    self.p_width +d, self.p_height -3 + d/2.0,
+                    self.p_width + d/2, self.p_height -3,
+                    self.p_width + lineHinting, self.p_height -3,
+                    self.p_width + lineHinting, self.p_height + lineHinting,
+                    -lineHinting, self.p_height + lineHinting,
+                    -lineHinting, -lineHinting,
+                ))
+
+            hw_path = QPainterPath()
+            hw_path.addPolygon(hardware_poly)
+            hw_path.closeSubpath()
+            return hw_gradient, hw_path
+
+        hw_poly_top = _polygon_from_coords((
+            -lineHinting, -lineHinting,
+            -lineHinting, 34,
+            -d /2.0, 34,
+            -d, 34 - d / 2.0,
+            -d, -d / 2.0,
+            -d / 2.0, -d,
+            self.p_width + d/2.0, -d,
+            self.p_width + d, -d / 2.0,
+            self.p_width + d, 34 - d/2,
+            self.p_width+ d/2, 34,
+            self.p_width + lineHinting, 34,
+            self.p_width + lineHinting, -lineHinting,
+        ))
+
+        # listed in the same winding direction as the top part
+        hw_poly_bt = _polygon_from_coords((
+            self.p_width + lineHinting, self.p_height + lineHinting,
+            self.p_width + lineHinting, self.p_height -3,
+            self.p_width +d/2, self.p_height -3,
+            self.p_width +d, self.p_height -3 + d/2,
+            self.p_width +d, self.p_height + d/2,
+            self.p_width + d/2, self.p_height + d,
+            -d/2, self.p_height + d,
+            -d, self.p_height + d/2,
+            -d, self.p_height -3 + d/2,
+            -d/2, self.p_height -3,
+            -lineHinting, self.p_height -3,
+            -lineHinting, self.p_height + lineHinting,
+        ))
+
+        # top and bottom parts are drawn with one drawPath call,
+        # they overlap on little boxes, so both must be filled
+        hw_path = QPainterPath()
+        hw_path.setFillRule(Qt.WindingFill)
+        for hw_poly in hw_poly_top, hw_poly_bt:
+            hw_path.addPolygon(hw_poly)
+            hw_path.closeSubpath()
+        return hw_gradient, hw_path
+
+    def _layout_title(self, has_icon: bool)->list:
+        ''' sets x and y of title lines and their text draw positions,
+            returns the horizontal lines to draw around the title '''
+        title_lines = self._title_lines
+        max_title_size = self._max_title_size
+
+        y_deltas = ()
+        if len(title_lines) >= 2:
+            y_deltas = _TITLE_Y_DELTAS[
+                (len(title_lines), title_lines[0].is_little)]
+        box_text_ypos = canvas.theme.box_text_ypos
+
+        for i, title_line in enumerate(title_lines):
+            title_line.y = box_text_ypos
+            if i < len(y_deltas):
+                title_line.y += y_deltas[i]
+
+        if has_icon:
+            title_x_pos = 29 + (self.p_width - 29 - max_title_size) / 2
+
+            for title_line in title_lines:
+                title_line.x = title_x_pos
+        else:
+            for title_line in title_lines:
+                title_line.x = (self.p_width - title_line.size) / 2
+
+        # rounded positions used to draw texts, in parallel lists
+        self._title_draw_xs = [int(tl.x + 0.5) for tl in title_lines]
+        self._title_draw_ys = [int(tl.y + 0.5) for tl in title_lines]
+
+        if has_icon:
+            if title_x_pos > 43:
+                return [QLineF(5, 16, int(title_x_pos -29 -5), 16),
+                        QLineF(int(title_x_pos + max_title_size + 5), 16,
+                               int(self.p_width -5), 16)]
+            return []
+
+        # all lines are centered, so the widest one gives the limits
+        left_xpos = (self.p_width - max_title_size) / 2
+        right_xpos = left_xpos + max_title_size
+
+        if left_xpos > 10:
+            return [QLineF(5, 16, int(left_xpos - 5), 16),
+                    QLineF(int(right_xpos + 5), 16,
+                           int(self.p_width - 5), 16)]
+        return []
+
     def paint(self, painter, option, widget):
         if canvas.scene.loading_items:
             return
-        
+
+        # bind to locals what is read many times in this method
+        theme = canvas.theme
+        title_lines = self._title_lines
+        is_selected = self.isSelected()
+
         painter.save()
-        painter.setRenderHint(QPainter.Antialiasing,
-                              bool(options.antialiasing == ANTIALIASING_FULL))
+        antialiasing = bool(options.antialiasing == ANTIALIASING_FULL)
+        painter.setRenderHint(QPainter.Antialiasing, antialiasing)
 
         # Draw rectangle
-        pen = QPen(canvas.theme.box_pen_sel if self.isSelected() else canvas.theme.box_pen)
+        pen = QPen(theme.box_pen_sel if is_selected else theme.box_pen)
         pen.setWidthF(pen.widthF() + 0.00001)
         painter.setPen(pen)
         brush = painter.brush()
         pen_width = pen.widthF()
         lineHinting = pen_width / 2
 
-        if self._is_hardware:
-            d = canvas.theme.hardware_rack_width
-            hw_gradient = QLinearGradient(-d, -d, self.p_width +d, self.p_height +d)
-            hw_gradient.setColorAt(0, QColor(60, 60, 43))
-            hw_gradient.setColorAt(0.5, QColor(40, 40, 24))
-            hw_gradient.setColorAt(1, QColor(60, 60, 43))
-
-            painter.setBrush(hw_gradient)
+        # the hardware rack is drawn around the box,
+        # no need to draw it if only the box inside is exposed
+        if (self._is_hardware
+                and not QRectF(0, 0, self.p_width, self.p_height).adjusted(
+                    1, 1, -1, -1).contains(option.exposedRect)):
+            d = theme.hardware_rack_width
+            hw_rack_sig = (self.p_width, self.p_height,
+                           self.m_current_port_mode, d, lineHinting)
+            if hw_rack_sig != self._hw_rack_sig:
+                self._hw_gradient, self._hw_path = \
+                    self._build_hardware_rack(d, lineHinting)
+                self._hw_rack_sig = hw_rack_sig
+
+            painter.setBrush(self._hw_gradient)
             painter.setPen(QPen(QColor(30, 30, 30), 1))
-            if self.m_current_port_mode != PORT_MODE_INPUT + PORT_MODE_OUTPUT:
-                hardware_poly = QPolygonF()
-
-                if self.m_current_port_mode == PORT_MODE_INPUT:
-                    hardware_poly += QPointF(- lineHinting, - lineHinting)
-                    hardware_poly += QPointF(- lineHinting, 34)
-                    hardware_poly += QPointF(-d /2.0, 34)
-                    hardware_poly += QPointF(-d, 34 - d / 2.0)
-                    hardware_poly += QPointF(-d, -d / 2.0)
-                    hardware_poly += QPointF(-d / 2.0, -d)
-                    hardware_poly += QPointF(self.p_width + d/2.0, -d)
-                    hardware_poly += QPointF(self.p_width + d, -d / 2.0)
-                    hardware_poly += QPointF(self.p_width + d, self.p_height + d/2.0)
-                    hardware_poly += QPointF(self.p_width + d/2.0, self.p_height + d)
-                    hardware_poly += QPointF(-d/2.0, self.p_height +d)
-                    hardware_poly += QPointF(-d, self.p_height +d/2.0)
-                    hardware_poly += QPointF(-d, self.p_height -3 + d/2.0)
-                    hardware_poly += QPointF(-d/2.0, self.p_height -3)
-                    hardware_poly += QPointF(- lineHinting, self.p_height -3)
-                    hardware_poly += QPointF(- lineHinting, self.p_height + lineHinting)
-                    hardware_poly += QPointF(self.p_width + lineHinting,
-                                             self.p_height + lineHinting)
-                    hardware_poly += QPointF(self.p_width + lineHinting, - lineHinting)
-                else:
-                    hardware_poly += QPointF(self.p_width + lineHinting, - lineHinting)
-                    hardware_poly += QPointF(self.p_width + lineHinting, 34)
-                    hardware_poly += QPointF(self.p_width + d/2.0, 34)
-                    hardware_poly += QPointF(self.p_width + d, 34 - d/2.0)
-                    hardware_poly += QPointF(self.p_width +d, -d / 2.0)
-                    hardware_poly += QPointF(self.p_width + d/2.0, -d)
-                    hardware_poly += QPointF(-d / 2.0, -d)
-                    hardware_poly += QPointF(-d, -d/2.0)
-                    hardware_poly += QPointF(-d, self.p_height + d/2.0)
-                    hardware_poly += QPointF(-d/2.0, self.p_height + d)
-                    hardware_poly += QPointF(self.p_width + d/2.0, self.p_height + d)
-                    hardware_poly += QPointF(self.p_width + d, self.p_height + d/2.0)
-                    hardware_poly += QPointF(self.p_width +d, self.p_height -3 + d/2.0)
-                    hardware_poly += QPointF(self.p_width + d/2, self.p_height -3)
-                    hardware_poly += QPointF(self.p_width + lineHinting, self.p_height -3)
-                    hardware_poly += QPointF(self.p_width + lineHinting,
-                                             self.p_height + lineHinting)
-                    hardware_poly += QPointF(-lineHinting, self.p_height + lineHinting)
-                    hardware_poly += QPointF(-lineHinting, -lineHinting)
-
-                painter.drawPolygon(hardware_poly)
-            else:
-                hw_poly_top = QPolygonF()
-                hw_poly_top += QPointF(-lineHinting, -lineHinting)
-                hw_poly_top += QPointF(-lineHinting, 34)
-                hw_poly_top += QPointF(-d /2.0, 34)
-                hw_poly_top += QPointF(-d, 34 - d / 2.0)
-                hw_poly_top += QPointF(-d, -d / 2.0)
-                hw_poly_top += QPointF(-d / 2.0, -d)
-                hw_poly_top += QPointF(self.p_width + d/2.0, -d)
-                hw_poly_top += QPointF(self.p_width + d, -d / 2.0)
-                hw_poly_top += QPointF(self.p_width + d, 34 - d/2)
-                hw_poly_top += QPointF(self.p_width+ d/2, 34)
-                hw_poly_top += QPointF(self.p_width + lineHinting, 34)
-                hw_poly_top += QPointF(self.p_width + lineHinting, -lineHinting)
-                painter.drawPolygon(hw_poly_top)
-
-                hw_poly_bt = QPolygonF()
-                hw_poly_bt += QPointF(-lineHinting, self.p_height + lineHinting)
-                hw_poly_bt += QPointF(-lineHinting, self.p_height -3)
-                hw_poly_bt += QPointF(-d/2, self.p_height -3)
-                hw_poly_bt += QPointF(-d, self.p_height -3 + d/2)
-                hw_poly_bt += QPointF(-d, self.p_height + d/2)
-                hw_poly_bt += QPointF(-d/2, self.p_height + d)
-                hw_poly_bt += QPointF(self.p_width + d/2, self.p_height + d)
-                hw_poly_bt += QPointF(self.p_width +d, self.p_height + d/2)
-                hw_poly_bt += QPointF(self.p_width +d, self.p_height -3 + d/2)
-                hw_poly_bt += QPointF(self.p_width +d/2, self.p_height -3)
-                hw_poly_bt += QPointF(self.p_width + lineHinting, self.p_height -3)
-                hw_poly_bt += QPointF(self.p_width + lineHinting, self.p_height + lineHinting)
-                painter.drawPolygon(hw_poly_bt)
-
-            pen = QPen(canvas.theme.box_pen_sel if self.isSelected() else canvas.theme.box_pen)
+            painter.drawPath(self._hw_path)
+
+            pen = QPen(theme.box_pen_sel if is_selected else theme.box_pen)
             pen.setWidthF(pen.widthF() + 0.00001)
             painter.setPen(pen)
             painter.setBrush(brush)
 
         rect = QRectF(0, 0, self.p_width, self.p_height)
 
-        if canvas.theme.box_bg_type == Theme.THEME_BG_GRADIENT:
-            max_size = max(self.p_height, self.p_width)
-            box_gradient = QLinearGradient(0, 0, max_size, max_size)
-            color_main = canvas.theme.box_bg_1
-            color_alter = canvas.theme.box_bg_2
-            gradient_size = 50
-
-            if True or self._is_hardware:
-                box_gradient = QLinearGradient(0, 0, max_size, max_size)
-                color_main = QColor(20, 20, 20)
-                color_alter = QColor(26, 24, 21)
-                gradient_size = 20
-
-            box_gradient.setColorAt(0, color_main)
-            tot = int(max_size / gradient_size)
-            for i in range(tot):
-                if i % 2 == 0:
-                    box_gradient.setColorAt((i/tot) ** 0.7, color_main)
-                else:
-                    box_gradient.setColorAt((i/tot) ** 0.7, color_alter)
-
-            painter.setBrush(box_gradient)
+        if theme.box_bg_type == Theme.THEME_BG_GRADIENT:
+            painter.setBrush(_get_striped_brush(
+                max(self.p_height, self.p_width),
+                QColor(20, 20, 20), QColor(26, 24, 21), 20, 0.7))
         else:
-            painter.setBrush(canvas.theme.box_bg_1)
+            painter.setBrush(theme.box_bg_1)
+
+        # axis-aligned rects and lines do not need antialiasing,
+        # it is re-enabled only for polygons
+        painter.setRenderHint(QPainter.Antialiasing, False)
 
         rect.adjust(lineHinting, lineHinting, -lineHinting, -lineHinting)
         painter.drawRect(rect)
 
         # Draw plugin inline display if supported
-        self.paintInlineDisplay(painter)
+        if self._inline_active:
+            self.paintInlineDisplay(painter)
 
         # Draw toggle GUI client button
         if self.m_can_handle_gui:
@@ -1667,196 +1850,142 @@ class CanvasBox(QGraphicsItem):
                                  self.p_width - 3.5, self.p_header_height - 3.5)
 
         elif self.m_group_name.endswith(' Monitor'):
-            bor_gradient = QLinearGradient(0, 0, self.p_height, self.p_height)
-            color_main = QColor(70, 70, 70)
-            color_alter = QColor(45, 45, 45)
-
-            tot = int(self.p_height / 20)
-            for i in range(tot):
-                if i % 2 == 0:
-                    bor_gradient.setColorAt(i/tot, color_main)
-                else:
-                    bor_gradient.setColorAt(i/tot, color_alter)
-
-            painter.setBrush(bor_gradient)
+            painter.setBrush(_get_striped_brush(
+                self.p_height, QColor(70, 70, 70), QColor(45, 45, 45), 20))
             painter.setPen(Qt.NoPen)
 
-            border_rect = QRectF(0, 0, 11, self.p_height)
-            border_rect.adjust(lineHinting * 2, lineHinting * 2,
-                               -2 * lineHinting, -2 * lineHinting)
-            top_pol = QPolygonF()
-            top_pol += QPointF(11 - 2 * lineHinting, lineHinting * 2)
-            top_pol += QPointF(11 - 2 * lineHinting + 13, lineHinting  * 2)
-            top_pol += QPointF(11 - 2 * lineHinting, 13 + lineHinting * 2)
-
-            band_mon_larger = 9
-            triangle_mon_size_top = 7
             triangle_mon_size_bottom = 0
             if self.p_height >= 100 or self._wrapping or self._unwrapping:
                 triangle_mon_size_bottom = 13
-            bml = band_mon_larger
-            tms_top = triangle_mon_size_top
-            tms_bot = triangle_mon_size_bottom
 
-            mon_poly = QPolygonF()
-            mon_poly += QPointF(pen_width, pen_width)
-            mon_poly += QPointF(pen_width + bml + tms_top, pen_width)
-            mon_poly += QPointF(pen_width + bml, pen_width + tms_top)
-            mon_poly += QPointF(pen_width + bml, self.p_height - tms_bot - pen_width)
-            mon_poly += QPointF(pen_width + bml + tms_bot, self.p_height - pen_width)
-            mon_poly += QPointF(pen_width, self.p_height - pen_width)
-
-            painter.drawPolygon(mon_poly)
+            mon_poly_sig = (self.p_height, pen_width, triangle_mon_size_bottom)
+            if mon_poly_sig != self._mon_poly_sig:
+                band_mon_larger = 9
+                triangle_mon_size_top = 7
+                bml = band_mon_larger
+                tms_top = triangle_mon_size_top
+                tms_bot = triangle_mon_size_bottom
+
+                mon_poly = _polygon_from_coords((
+                    pen_width, pen_width,
+                    pen_width + bml + tms_top, pen_width,
+                    pen_width + bml, pen_width + tms_top,
+                    pen_width + bml, self.p_height - tms_bot - pen_width,
+                    pen_width + bml + tms_bot, self.p_height - pen_width,
+                    pen_width, self.p_height - pen_width,
+                ))
+
+                self._mon_poly = mon_poly
+                self._mon_poly_sig = mon_poly_sig
+
+            painter.setRenderHint(QPainter.Antialiasing, antialiasing)
+            painter.drawPolygon(self._mon_poly)
+            painter.setRenderHint(QPainter.Antialiasing, False)
 
         # Draw pixmap header
-        rect.setHeight(canvas.theme.box_header_height)
-        if canvas.theme.box_header_pixmap:
+        rect.setHeight(theme.box_header_height)
+        if theme.box_header_pixmap:
             painter.setPen(Qt.NoPen)
-            painter.setBrush(canvas.theme.box_bg_2)
+            painter.setBrush(theme.box_bg_2)
 
             # outline
             rect.adjust(lineHinting, lineHinting, -lineHinting, -lineHinting)
             painter.drawRect(rect)
 
             rect.adjust(1, 1, -1, 0)
-            painter.drawTiledPixmap(rect, canvas.theme.box_header_pixmap, rect.topLeft())
+            painter.drawTiledPixmap(rect, theme.box_header_pixmap, rect.topLeft())
         
         # Draw text
-        title_x_pos = 8
-        if self.has_top_icon():
-            title_x_pos += 25
-
-        for title_line in self._title_lines:
-            title_line.x = title_x_pos
-            title_line.y = canvas.theme.box_text_ypos
-
-        if len(self._title_lines) >= 2:
-            if self._title_lines[0].is_little:
-                self._title_lines[0].y -= 7
-                self._title_lines[1].y += 9
-                if len(self._title_lines) >= 3:
-                    self._title_lines[2].y += 24
-            else:
-                if len(self._title_lines) == 4:
-                    self._title_lines[0].y -= 9
-                    self._title_lines[1].y += 2
-                    self._title_lines[2].y += 13
-                    self._title_lines[3].y += 24
-                else:
-                    self._title_lines[0].y -= 6
-                    self._title_lines[1].y += 9
-                    if len(self._title_lines) >= 3:
-                        self._title_lines[2].y += 24
-
-        max_title_size = 0
-        for title_line in self._title_lines:
-            max_title_size = max(max_title_size, title_line.size)
+        # title layout only changes with box width, icon or title lines
+        has_icon = self.has_top_icon()
+        title_layout_sig = (self.p_width, has_icon, title_lines,
+                            theme.box_text_ypos)
+        if title_layout_sig != self._title_layout_sig:
+            self._title_deco_lines = self._layout_title(has_icon)
+            self._title_layout_sig = title_layout_sig
 
         # may draw horizontal lines around title
-        # and set x on title lines
-        painter.setPen(QPen(QColor(255, 192, 0, 80), 1))
-
-        if self.has_top_icon():
-            title_x_pos = 29 + (self.p_width - 29 - max_title_size) / 2
-
-            if title_x_pos > 43:
-                painter.drawLine(5, 16, int(title_x_pos -29 -5), 16)
-                painter.drawLine(
-                    int(title_x_pos + max_title_size + 5), 16,
-                    int(self.p_width -5), 16)
-
-            for title_line in self._title_lines:
-                title_line.x = title_x_pos
-        else:
-            left_xpos = self.p_width
-            right_xpos = 0
-
-            for title_line in self._title_lines:
-                title_line.x = (self.p_width - title_line.size) / 2
-                left_xpos = min(left_xpos, title_line.x)
-                right_xpos = max(right_xpos, title_line.x + title_line.size)
-
-            if left_xpos > 10:
-                painter.drawLine(5, 16, int(left_xpos - 5), 16)
-                painter.drawLine(int(right_xpos + 5), 16,
-                                 int(self.p_width - 5), 16)
+        if self._title_deco_lines:
+            painter.setPen(QPen(QColor(255, 192, 0, 80), 1))
+            painter.drawLines(self._title_deco_lines)
 
         if self._is_hardware:
-            painter.setPen(canvas.theme.box_text_hw)
-        elif self.isSelected():
-            painter.setPen(canvas.theme.box_text_sel)
+            painter.setPen(theme.box_text_hw)
+        elif is_selected:
+            painter.setPen(theme.box_text_sel)
         else:
-            painter.setPen(canvas.theme.box_text)
+            painter.setPen(theme.box_text)
 
         # draw title lines
-        for title_line in self._title_lines:
+        global_opacity = canvas.semi_hide_opacity if self.m_is_semi_hidden else 1.0
+
+        for title_line, draw_x, draw_y in zip(
+                title_lines, self._title_draw_xs, self._title_draw_ys):
             painter.setFont(title_line.font)
-            
-            global_opacity = canvas.semi_hide_opacity if self.m_is_semi_hidden else 1.0
             painter.setOpacity(global_opacity)
             if title_line.is_little:
                 painter.setOpacity(0.5 * global_opacity)
 
-            if (title_line == self._title_lines[-1]
+            if (title_line == title_lines[-1]
                     and self.m_group_name.endswith(' Monitor')):
                 # Title line endswith " Monitor"
                 # Draw "Monitor" in yellow
                 # but keep the rest in white
                 pre_text = title_line.text.rpartition(' Monitor')[0]
-                painter.drawText(
-                    int(title_line.x + 0.5),
-                    int(title_line.y + 0.5),
-                    pre_text)
+                painter.drawText(draw_x, draw_y, pre_text)
 
                 x_pos = title_line.x
                 if pre_text:
-                    x_pos += QFontMetrics(title_line.font).width(pre_text)
-                    x_pos += QFontMetrics(title_line.font).width(' ')
+                    x_pos += title_line.text_width(pre_text)
+                    x_pos += title_line.text_width(' ')
 
                 painter.setPen(QPen(QColor(190, 158, 0), 0))
-                painter.drawText(int(x_pos + 0.5), int(title_line.y + 0.5),
-                                 'Monitor')
+                painter.drawText(int(x_pos + 0.5), draw_y, 'Monitor')
             else:
-                painter.drawText(
-                    int(title_line.x + 0.5),
-                    int(title_line.y + 0.5),
-                    title_line.text)
+                painter.drawText(draw_x, draw_y, title_line.text)
 
         # draw (un)wrapper triangles
-        painter.setPen(canvas.theme.box_pen)
+        painter.setRenderHint(QPainter.Antialiasing, antialiasing)
+        painter.setPen(theme.box_pen)
         painter.setBrush(QColor(255, 192, 0, 80))
         if self._is_hardware:
-            painter.setPen(canvas.theme.box_pen_hw)
+            painter.setPen(theme.box_pen_hw)
             painter.setBrush(QColor(255, 192, 0, 60))
 
         if self._wrapped:
+            # input and output triangles are drawn with one drawPath call
+            triangles_path = QPainterPath()
+
             for port_mode in PORT_MODE_INPUT, PORT_MODE_OUTPUT:
                 if self.m_current_port_mode & port_mode:
                     side = 6
                     x = 6
 
-                    ypos = canvas.theme.box_header_height
-                    if len(self._title_lines) >= 3:
+                    ypos = theme.box_header_height
+                    if len(title_lines) >= 3:
                         ypos += 14
 
                     if port_mode == PORT_MODE_OUTPUT:
                         x = self.p_width - (x + 2 * side)
 
-                    triangle = QPolygonF()
-                    triangle += QPointF(x, ypos + 2)
-                    triangle += QPointF(x + 2 * side, ypos + 2)
-                    triangle += QPointF(x + side, ypos + side + 2)
-                    painter.drawPolygon(triangle)
+                    triangle = QPolygonF([
+                        QPointF(x, ypos + 2),
+                        QPointF(x + 2 * side, ypos + 2),
+                        QPointF(x + side, ypos + side + 2)])
+                    triangles_path.addPolygon(triangle)
+                    triangles_path.closeSubpath()
+
+            painter.drawPath(triangles_path)
 
         elif self.p_unwrap_triangle_pos == UNWRAP_BUTTON_LEFT:
             side = 6
             x = 4
             
             ypos = self.p_height - 6
-            triangle = QPolygonF()
-            triangle += QPointF(x, ypos + 2)
-            triangle += QPointF(x + 2 * side, ypos + 2)
-            triangle += QPointF(x + side, ypos -side + 2)
+            triangle = QPolygonF([
+                QPointF(x, ypos + 2),
+                QPointF(x + 2 * side, ypos + 2),
+                QPointF(x + side, ypos -side + 2)])
             painter.drawPolygon(triangle)
         
         elif self.p_unwrap_triangle_pos == UNWRAP_BUTTON_RIGHT:
@@ -1864,10 +1993,10 @@ class CanvasBox(QGraphicsItem):
             x = self.p_width - 2 * side - 4
             
             ypos = self.p_height - 6
-            triangle = QPolygonF()
-            triangle += QPointF(x, ypos + 2)
-            triangle += QPointF(x + 2 * side, ypos + 2)
-            triangle += QPointF(x + side, ypos -side + 2)
+            triangle = QPolygonF([
+                QPointF(x, ypos + 2),
+                QPointF(x + 2 * side, ypos + 2),
+                QPointF(x + side, ypos -side + 2)])
             painter.drawPolygon(triangle)
         
         elif self.p_unwrap_triangle_pos == UNWRAP_BUTTON_CENTER:
@@ -1875,10 +2004,10 @@ class CanvasBox(QGraphicsItem):
             x = self.p_width_in + 8
             
             ypos = self.p_height - 3 + 0.5
-            triangle = QPolygonF()
-            triangle += QPointF(x, ypos + 2)
-            triangle += QPointF(x + 2 * side, ypos + 2)
-            triangle += QPointF(x + side, ypos -side + 2)
+            triangle = QPolygonF([
+                QPointF(x, ypos + 2),
+                QPointF(x + 2 * side, ypos + 2),
+                QPointF(x + side, ypos -side + 2)])
             painter.drawPolygon(triangle)
 
         self.repaintLines()
@@ -1886,33 +2015,36 @@ class CanvasBox(QGraphicsItem):
         painter.restore()
 
     def paintInlineDisplay(self, painter):
-        if self.m_plugin_inline == self.INLINE_DISPLAY_DISABLED:
-            return
-        if not options.inline_displays:
-            return
-
+        # only called when self._inline_active is True, so inline display
+        # is enabled for this box and in options.
         inwidth  = self.p_width - self.p_width_in - self.p_width_out - 16
         inheight = self.p_height - canvas.theme.box_header_height - canvas.theme.box_header_spacing - canvas.theme.port_spacing - 3
         scaling  = canvas.scene.getScaleFactor() * canvas.scene.getDevicePixelRatioF()
+        # quantized scaling, avoids to request a new image on tiny float changes
+        scaling_q = round(scaling * 1000)
 
         if self.m_plugin_id >= 0 and self.m_plugin_id <= MAX_PLUGIN_ID_ALLOWED and (
-           self.m_plugin_inline == self.INLINE_DISPLAY_ENABLED or self.m_inline_scaling != scaling):
+           self.m_plugin_inline == self.INLINE_DISPLAY_ENABLED or self.m_inline_scaling_q != scaling_q):
             size = "%i:%i" % (int(inwidth*scaling), int(inheight*scaling))
             data = canvas.callback(ACTION_INLINE_DISPLAY, self.m_plugin_id, 0, size)
             if data is None:
                 return
 
-            # invalidate old image first
-            del self.m_inline_image
+            # keep a reference on pixels buffer, QImage does not copy it
+            inline_data = data['data']
+            if not isinstance(inline_data, (bytes, bytearray)):
+                inline_data = bytes(inline_data)
 
-            self.m_inline_data = pack("%iB" % (data['height'] * data['stride']), *data['data'])
-            self.m_inline_image = QImage(voidptr(self.m_inline_data), data['width'], data['height'], data['stride'], QImage.Format_ARGB32)
-            self.m_inline_scaling = scaling
+            # replace the image before its buffer, so old image
+            # never refers to a released buffer
+            self.m_inline_image = QImage(voidptr(inline_data), data['width'], data['height'], data['stride'], QImage.Format_ARGB32)
+            self.m_inline_data = inline_data
+            self.m_inline_scaling_q = scaling_q
             self.m_plugin_inline = self.INLINE_DISPLAY_CACHED
 
         if self.m_inline_image is None:
-            sys.stderr.write("ERROR: inline display image is None for\n",
-                             self.m_plugin_id, self.m_group_name)
+            sys.stderr.write("ERROR: inline display image is None for %i %s\n"
+                             % (self.m_plugin_id, self.m_group_name))
             return
 
         swidth = self.m_inline_image.width() / scaling
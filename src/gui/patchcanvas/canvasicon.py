@@ -46,7 +46,18 @@ from . import (
 )
 
 # ------------------------------------------------------------------------------------------------------------
+
+# svg renderers shared by all CanvasSvgIcon, each svg file is parsed once
+_svg_renderers = {}
+
+# icons found by getAppIcon, avoids to search files at each call
+_app_icons = {}
+
 def getAppIcon(icon_name):
+    cached_icon = _app_icons.get(icon_name)
+    if cached_icon is not None:
+        return cached_icon
+
     #dark = bool(
         #widget.palette().brush(
             #2, QPalette.WindowText).color().lightness() > 128)
@@ -77,6 +88,7 @@ def getAppIcon(icon_name):
                     icon.addFile(filename)
                     break
 
+    _app_icons[icon_name] = icon
     return icon
 
 class CanvasIconPixmap(QGraphicsPixmapItem):
@@ -86,6 +98,7 @@ class CanvasIconPixmap(QGraphicsPixmapItem):
 
         self.p_size = QRectF(0.0, 0.0, 24.0, 24.0)
         self.icon = None
+        self._pixmaps_cache = {}
         self.x_offset = 4
         self.y_offset = 4
 
@@ -94,6 +107,7 @@ class CanvasIconPixmap(QGraphicsPixmapItem):
 
     def setIcon(self, icon, name):
         self.icon = getAppIcon(name)
+        self._pixmaps_cache.clear()
         if not self.icon.isNull():
             pixmap = self.icon.pixmap(24, 24)
             self.setPixmap(pixmap)
@@ -103,7 +117,14 @@ class CanvasIconPixmap(QGraphicsPixmapItem):
         if self.icon is None or scale <= 0.0:
             return
 
-        pixmap = self.icon.pixmap(int(0.5 + 24 * scale), int(0.5 + 24 * scale))
+        # rendering the icon is slow, keep pixmaps of last used sizes
+        size = int(0.5 + 24 * scale)
+        pixmap = self._pixmaps_cache.get(size)
+        if pixmap is None:
+            pixmap = self.icon.pixmap(size, size)
+            if len(self._pixmaps_cache) < 8:
+                self._pixmaps_cache[size] = pixmap
+
         self.setPixmap(pixmap)
         self.setScale(1.0 / scale)
         self.setOffset(float(self.x_offset * scale), float(self.y_offset * scale))
@@ -210,7 +231,11 @@ class CanvasSvgIcon(QGraphicsSvgItem):
                       icon2str(icon), name.encode()))
             return
 
-        self.m_renderer = QSvgRenderer(icon_path, canvas.scene)
+        self.m_renderer = _svg_renderers.get(icon_path)
+        if self.m_renderer is None:
+            self.m_renderer = QSvgRenderer(icon_path)
+            _svg_renderers[icon_path] = self.m_renderer
+
         self.setSharedRenderer(self.m_renderer)
         self.update()
 
@@ -19,7 +19,9 @@
 # ------------------------------------------------------------------------------------------------------------
 # Imports (Global)
 
-from PyQt5.QtCore import qWarning, Qt, QLineF
+import types
+
+from PyQt5.QtCore import qWarning, Qt
 from PyQt5.QtGui import QPainter, QPen
 from PyQt5.QtWidgets import QGraphicsLineItem
 
@@ -44,10 +46,103 @@ from . import (
 
 # ------------------------------------------------------------------------------------------------------------
 
+# line ends spread ratio, indexed by (portgrp_len > 2)
+_PHI = (0.62, 0.75)
+
+# theme color attribute for each port type
+_PEN_COLOR_ATTRS = {
+    PORT_TYPE_AUDIO_JACK: 'line_audio_jack',
+    PORT_TYPE_MIDI_JACK: 'line_midi_jack',
+    PORT_TYPE_MIDI_ALSA: 'line_midi_alsa',
+    PORT_TYPE_PARAMETER: 'line_parameter',
+}
+
+# pens are built from the current theme on first use, keyed by port type
+_pens = {}
+
+def _build_pen(color, width=2.00001):
+    # width is slightly over the integer one on purpose
+    pen = QPen(color, width)
+    pen.setCapStyle(Qt.RoundCap)
+    return pen
+
+def _portgrp_y(port_pos, portgrp_len, port_height, phi):
+    # y of the line end for port_pos, lines being spread
+    # from port_height * phi to port_height * (portgrp_len - phi)
+    if portgrp_len <= 1:
+        return port_height * phi
+
+    return port_height * (
+        phi + port_pos * (portgrp_len - 2.0 * phi) / (portgrp_len - 1.0))
+
+def _ignore_line_pos(line_mov, scenePos):
+    pass
+
+def _get_pen(port_type):
+    pen = _pens.get(port_type)
+    if pen is not None:
+        return pen
+
+    attr = _PEN_COLOR_ATTRS.get(port_type)
+    if attr is None:
+        return None
+
+    pen = _pens[port_type] = _build_pen(getattr(canvas.theme, attr))
+    return pen
+
+# ------------------------------------------------------------------------------------------------------------
+
 class CanvasLineMov(QGraphicsLineItem):
+    __slots__ = [
+        '_parent_type',
+        'm_port_mode',
+        'm_port_type',
+        'm_port_pos_from',
+        'm_port_pos_dest',
+        'm_portgrp_len_from',
+        'm_portgrp_len_dest',
+        'p_lineX',
+        'p_lineY',
+        'p_width',
+        '_fixed_x',
+        '_fixed_y',
+        '_mouse_y_offset',
+        '_end_dy',
+        '_last_sx',
+        '_last_sy'
+    ]
+
+    # one line kept per (port_type, port_mode) for the next drag
+    _pool = {}
+
     def __init__(self, port_mode, port_type, port_pos, portgrp_len, parent):
         QGraphicsLineItem.__init__(self)
+        self.reset(port_mode, port_type, port_pos, portgrp_len, parent)
+
+    @classmethod
+    def acquire(cls, port_mode, port_type, port_pos, portgrp_len, parent):
+        line_mov = cls._pool.pop((port_type, port_mode), None)
+        if line_mov is None:
+            return cls(port_mode, port_type, port_pos, portgrp_len, parent)
+
+        line_mov.reset(port_mode, port_type, port_pos, portgrp_len, parent)
+        line_mov.setLine(0.0, 0.0, 0.0, 0.0)
+        return line_mov
+
+    def release(self):
+        # pooled lines are kept out of the scene, so that clearing the scene
+        # can't delete them, reset() adds them back with setParentItem()
+        self.setParentItem(None)
+        if self.scene():
+            self.scene().removeItem(self)
+
+        key = (self.m_port_type, self.m_port_mode)
+        if key not in CanvasLineMov._pool:
+            CanvasLineMov._pool[key] = self
+
+    def reset(self, port_mode, port_type, port_pos, portgrp_len, parent):
         self.setParentItem(parent)
+        self._parent_type = parent.type()
 
         self.m_port_mode = port_mode
         self.m_port_type = port_type
@@ -61,74 +156,106 @@ class CanvasLineMov(QGraphicsLineItem):
         self.p_lineY = self.scenePos().y()
         self.p_width = parent.getPortWidth()
 
-        if port_type == PORT_TYPE_AUDIO_JACK:
-            pen = QPen(canvas.theme.line_audio_jack, 2)
-        elif port_type == PORT_TYPE_MIDI_JACK:
-            pen = QPen(canvas.theme.line_midi_jack, 2)
-        elif port_type == PORT_TYPE_MIDI_ALSA:
-            pen = QPen(canvas.theme.line_midi_alsa, 2)
-        elif port_type == PORT_TYPE_PARAMETER:
-            pen = QPen(canvas.theme.line_parameter, 2)
-        else:
+        pen = _get_pen(port_type)
+        if pen is None:
             qWarning("PatchCanvas::CanvasLineMov(%s, %s, %s) - invalid port type" % (port_mode2str(port_mode), port_type2str(port_type), parent))
-            pen = QPen(Qt.black)
+            pen = _build_pen(Qt.black, 1.00001)
 
-        pen.setCapStyle(Qt.RoundCap)
-        pen.setWidthF(pen.widthF() + 0.00001)
         self.setPen(pen)
 
-    def setDestinationPortGroupPosition(self, port_pos, portgrp_len):
-        self.m_port_pos_dest = port_pos
-        self.m_portgrp_len_dest = portgrp_len
-
-    def updateLinePos(self, scenePos):
-        phi = 0.75 if self.m_portgrp_len_from > 2 else 0.62
-        phito = 0.75 if self.m_portgrp_len_dest > 2 else 0.62
+        # line start on the source port doesn't change while moving either
+        self._fixed_y = 0
+        self._mouse_y_offset = 0.0
+        self._end_dy = 0.0
+        self._last_sx = self._last_sy = None
 
-        item_pos = [0, 0]
+        # a line from an invalid port mode never moves,
+        # give it a no-op updateLinePos() instead of checking on each move
+        self.__dict__.pop('updateLinePos', None)
 
-        if self.m_port_mode == PORT_MODE_INPUT:
-            item_pos[0] = 0
-        elif self.m_port_mode == PORT_MODE_OUTPUT:
-            item_pos[0] = self.p_width + 12
+        if port_mode == PORT_MODE_INPUT:
+            self._fixed_x = 0
+        elif port_mode == PORT_MODE_OUTPUT:
+            self._fixed_x = self.p_width + 12
         else:
+            self._fixed_x = 0
+            self.updateLinePos = types.MethodType(_ignore_line_pos, self)
             return
 
-        if self.parentItem().type() == CanvasPortType:
-            if self.m_portgrp_len_from > 1:
-                first_old_y = canvas.theme.port_height * phi
-                last_old_y  = canvas.theme.port_height * (self.m_portgrp_len_from - phi)
-                delta = (last_old_y - first_old_y) / (self.m_portgrp_len_from -1)
-                item_pos[1] = first_old_y + (self.m_port_pos_from * delta) \
-                              - (canvas.theme.port_height * self.m_port_pos_from)
+        ph = canvas.theme.port_height
+        plen_from = self.m_portgrp_len_from
+        ppos_from = self.m_port_pos_from
+        phi = _PHI[plen_from > 2]
+
+        if self._parent_type == CanvasPortType:
+            if plen_from > 1:
+                self._fixed_y = _portgrp_y(ppos_from, plen_from, ph, phi) - ph * ppos_from
             else:
-                item_pos[1] = float(canvas.theme.port_height)/2
+                self._fixed_y = ph * 0.5
+
+        elif self._parent_type == CanvasPortGroupType:
+            self._fixed_y = _portgrp_y(ppos_from, plen_from, ph, phi)
+
+        self._recompute_offset()
 
-        elif self.parentItem().type() == CanvasPortGroupType:
-            first_old_y = canvas.theme.port_height * phi
-            last_old_y  = canvas.theme.port_height * (self.m_portgrp_len_from - phi)
-            delta = (last_old_y - first_old_y) / (self.m_portgrp_len_from -1)
-            item_pos[1] = first_old_y + (self.m_port_pos_from * delta)
+    @classmethod
+    def reset_pen_cache(cls):
+        # theme colors changed, pens will be rebuilt on next line creation
+        _pens.clear()
 
-        if self.m_portgrp_len_dest == 1:
-            mouse_y_offset = 0
+    def _recompute_offset(self):
+        plen_dest = self.m_portgrp_len_dest
+        if plen_dest == 1:
+            self._mouse_y_offset = 0
         else:
-            first_new_y = canvas.theme.port_height * phito
-            last_new_y  = canvas.theme.port_height * (self.m_portgrp_len_dest - phito)
-            delta = (last_new_y - first_new_y) / (self.m_portgrp_len_dest -1)
-            new_y1 = first_new_y + (self.m_port_pos_dest * delta)
-            mouse_y_offset = new_y1 - ( (last_new_y - first_new_y) / 2 ) - (canvas.theme.port_height * phito)
+            ph = canvas.theme.port_height
+            phito = _PHI[plen_dest > 2]
+
+            # the mouse points to the middle of the destination port group
+            self._mouse_y_offset = (_portgrp_y(self.m_port_pos_dest, plen_dest, ph, phito)
+                                    - ph * plen_dest * 0.5)
+
+        # all updateLinePos() has to add to the mouse scene y
+        self._end_dy = self._mouse_y_offset - self.p_lineY
+
+    def setDestinationPortGroupPosition(self, port_pos, portgrp_len):
+        if (port_pos == self.m_port_pos_dest
+                and portgrp_len == self.m_portgrp_len_dest):
+            return
 
-        line = QLineF(item_pos[0], item_pos[1], scenePos.x() - self.p_lineX, scenePos.y() - self.p_lineY + mouse_y_offset)
-        self.setLine(line)
+        self.m_port_pos_dest = port_pos
+        self.m_portgrp_len_dest = portgrp_len
+        self._recompute_offset()
+        self._last_sx = self._last_sy = None
+
+    def updateLinePos(self, scenePos):
+        sx = scenePos.x()
+        sy = scenePos.y()
+
+        # ignore sub-pixel mouse moves
+        if (self._last_sx is not None
+                and abs(sx - self._last_sx) + abs(sy - self._last_sy) < 0.5):
+            return
+
+        self._last_sx = sx
+        self._last_sy = sy
+
+        self.setLine(self._fixed_x, self._fixed_y,
+                     sx - self.p_lineX, sy + self._end_dy)
 
     def type(self):
         return CanvasLineMovType
 
     def paint(self, painter, option, widget):
-        painter.save()
-        painter.setRenderHint(QPainter.Antialiasing, bool(options.antialiasing))
+        antialiasing = bool(options.antialiasing)
+        previous = painter.testRenderHint(QPainter.Antialiasing)
+
+        if previous != antialiasing:
+            painter.setRenderHint(QPainter.Antialiasing, antialiasing)
+
         QGraphicsLineItem.paint(self, painter, option, widget)
-        painter.restore()
+
+        if previous != antialiasing:
+            painter.setRenderHint(QPainter.Antialiasing, previous)
 
 # ------------------------------------------------------------------------------------------------------------
@@ -249,9 +249,7 @@ class CanvasPort(QGraphicsItem):
             if i < 1:
                 line_mov.setDestinationPortGroupPosition(i, 1)
             else:
-                item = line_mov
-                canvas.scene.removeItem(item)
-                del item
+                line_mov.release()
 
         self.m_line_mov_list = self.m_line_mov_list[:1]
 
@@ -411,8 +409,8 @@ class CanvasPort(QGraphicsItem):
                 line_mov = CanvasBezierLineMov(self.m_port_mode,
                                                self.m_port_type, 0, 1, self)
             else:
-                line_mov = CanvasLineMov(self.m_port_mode, self.m_port_type,
-                                         0, 1, self)
+                line_mov = CanvasLineMov.acquire(self.m_port_mode,
+                                                 self.m_port_type, 0, 1, self)
 
             self.m_line_mov_list.append(line_mov)
             line_mov.setZValue(canvas.last_z_value)
@@ -490,7 +488,7 @@ class CanvasPort(QGraphicsItem):
                                 self.m_port_mode, self.m_port_type,
                                 port_pos, portgrp_len, self)
                         else:
-                            line_mov = CanvasLineMov(
+                            line_mov = CanvasLineMov.acquire(
                                 self.m_port_mode, self.m_port_type,
                                 port_pos, portgrp_len, self)
 
@@ -570,9 +568,7 @@ class CanvasPort(QGraphicsItem):
         if self.m_mouse_down:
             if self.m_line_mov_list:
                 for line_mov in self.m_line_mov_list:
-                    item = line_mov
-                    canvas.scene.removeItem(item)
-                    del item
+                    line_mov.release()
                 self.m_line_mov_list.clear()
 
             for connection in canvas.connection_list:
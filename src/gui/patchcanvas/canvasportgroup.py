@@ -331,9 +331,7 @@ class CanvasPortGroup(QGraphicsItem):
             if i < self.getPortLength():
                 line_mov.setDestinationPortGroupPosition(i, self.getPortLength())
             else:
-                item = line_mov
-                canvas.scene.removeItem(item)
-                del item
+                line_mov.release()
 
         while len(self.m_line_mov_list) < self.getPortLength():
             if options.use_bezier_lines:
@@ -341,7 +339,7 @@ class CanvasPortGroup(QGraphicsItem):
                                                len(self.m_line_mov_list),
                                                self.getPortLength(), self)
             else:
-                line_mov = CanvasLineMov(self.m_port_mode, self.m_port_type,
+                line_mov = CanvasLineMov.acquire(self.m_port_mode, self.m_port_type,
                             len(self.m_line_mov_list), self.getPortLength(), self)
             self.m_line_mov_list.append(line_mov)
 
@@ -418,7 +416,7 @@ class CanvasPortGroup(QGraphicsItem):
                     line_mov  = CanvasBezierLineMov(self.m_port_mode,
                         self.m_port_type, i, len(self.m_port_id_list), self)
                 else:
-                    line_mov  = CanvasLineMov(self.m_port_mode,
+                    line_mov  = CanvasLineMov.acquire(self.m_port_mode,
                         self.m_port_type, i, len(self.m_port_id_list), self)
 
                 self.m_line_mov_list.append(line_mov)
@@ -544,7 +542,7 @@ class CanvasPortGroup(QGraphicsItem):
                                         self.m_hover_item.getPortLength(),
                                         self)
                                 else:
-                                    line_mov  = CanvasLineMov(
+                                    line_mov  = CanvasLineMov.acquire(
                                         self.m_port_mode,
                                         self.m_port_type,
                                         port_posinportgrp,
@@ -605,9 +603,7 @@ class CanvasPortGroup(QGraphicsItem):
             if self.m_mouse_down:
 
                 for line_mov in self.m_line_mov_list:
-                    item = line_mov
-                    canvas.scene.removeItem(item)
-                    del item
+                    line_mov.release()
                 self.m_line_mov_list.clear()
 
                 for connection in canvas.connection_list:
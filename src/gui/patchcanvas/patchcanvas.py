@@ -56,6 +56,7 @@ from . import (
 from .canvasbox import CanvasBox
 from .canvasbezierline import CanvasBezierLine
 from .canvasline import CanvasLine
+from .canvaslinemov import CanvasLineMov
 from .theme import Theme, getDefaultTheme, getThemeName
 from .utils import (CanvasCallback, CanvasGetNewGroupPos, CanvasItemFX,
     CanvasRemoveItemFX, CanvasGetPortGroupPosition, CanvasGetNewGroupPositions)
@@ -205,6 +206,7 @@ def init(appName, scene, callback, debug=False):
     if not canvas.theme:
         canvas.theme = Theme(getDefaultTheme())
 
+    CanvasLineMov.reset_pen_cache()
     canvas.scene.updateTheme()
 
     canvas.initiated = True
@@ -1254,6 +1256,7 @@ def arrange():
 
 def changeTheme(idx: int):
     canvas.theme.setTheme(idx)
+    CanvasLineMov.reset_pen_cache()
     canvas.scene.updateTheme()
 
     for group in canvas.group_list: